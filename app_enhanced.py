@@ -3,87 +3,256 @@ Enhanced Flask API with Web Scraping
 Works with ANY Amazon/Flipkart product link
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.neighbors import NearestNeighbors
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+import os
 import re
+import functools
+import threading
 import traceback
 import random
+import logging
+import orjson
+import ahocorasick
+from collections import defaultdict
+from cachetools import LRUCache, TTLCache
 from urllib.parse import quote, quote_plus, urlparse, unquote
 
 app = Flask(__name__)
 CORS(app)
 
+log = logging.getLogger('pricetracker')
+
+def _json_response(payload, status=200):
+    """Serialize a response with orjson (handles numpy scalars natively)."""
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+# ==========================================
+# HTTP SESSION (connection pooling + keep-alive)
+# ==========================================
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+]
+
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+_BASE_HEADERS = {
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    # brotli is installed, so urllib3/aiohttp transparently decode 'br' bodies
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Referer': 'https://www.google.com/',
+}
+SESSION.headers.update(_BASE_HEADERS)
+
+# Pre-baked per-UA header dicts: no per-request dict build, and the aiohttp
+# path gets the full header set without a session-level default
+_HEADER_POOL = tuple({'User-Agent': ua, **_BASE_HEADERS} for ua in USER_AGENTS)
+
+# ==========================================
+# SCRAPE RESULT CACHE (skip duplicate fetches)
+# ==========================================
+_SCRAPE_CACHE = TTLCache(maxsize=4096, ttl=900)
+_SCRAPE_LOCK = threading.Lock()
+_MAX_CONCURRENT_SCRAPES = 64
+# Dedicated pool for CPU-bound HTML parsing so parse offload never
+# contends with asyncio's shared default executor
+_PARSE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='parse')
+
+async def _parse_in_pool(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_PARSE_POOL, fn, *args)
+
+# Per-request cache bypass (?nocache=1); set by analyze_product, read here
+_CACHE_BYPASS = threading.local()
+
+def _scrape_cache_get(key):
+    if getattr(_CACHE_BYPASS, 'active', False):
+        return None
+    with _SCRAPE_LOCK:
+        return _SCRAPE_CACHE.get(key)
+
+def _scrape_cache_put(key, result):
+    # Don't pin total failures for the whole TTL; they should retry
+    if result is None:
+        return
+    if isinstance(result, dict) and result.get('price') is None and result.get('title') is None:
+        return
+    with _SCRAPE_LOCK:
+        _SCRAPE_CACHE[key] = result
+
+def _cached_scrape(fn):
+    """Serve repeat scrapes of the same arguments from the TTL cache."""
+    @functools.wraps(fn)
+    def wrapper(*args):
+        key = (fn.__name__,) + args
+        cached = _scrape_cache_get(key)
+        if cached is not None:
+            return cached
+        result = fn(*args)
+        _scrape_cache_put(key, result)
+        return result
+    return wrapper
+
+# ==========================================
+# PRECOMPILED REGEXES (hot parsing paths)
+# ==========================================
+_PRICE_RE = re.compile(r'(\d[\d,]*\.?\d*)')
+_RS_RE = re.compile(r'Rs\.?')
+_CURRENCY_DELETE = str.maketrans('', '', '₹')
+_LD_PRICE_RE = re.compile(r'"price"\s*:\s*"?(?P<price>\d[\d,]*\.?\d*)"?')
+_LD_CURRENT_PRICE_RE = re.compile(r'"currentPrice"\s*:\s*"?(?P<price>\d[\d,]*\.?\d*)"?')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+_SLUG_RE = re.compile(r'[^a-zA-Z0-9\-\+ ]')
+_WS_RE = re.compile(r'\s+')
+_GENERIC_NAME_RE = re.compile(r'(?:(?:amazon|flipkart|myntra) )?product')
+
+# ==========================================
+# HTML PARSING (thread-local lxml parser reuse)
+# ==========================================
+_TLS = threading.local()
+
+def _html_parser():
+    parser = getattr(_TLS, 'parser', None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(recover=True)
+        _TLS.parser = parser
+    return parser
+
+def _parse_html(html):
+    """Parse HTML into an lxml tree, reusing a thread-local parser."""
+    return lxml.html.fromstring(html, parser=_html_parser())
+
+def _stream_tree(url):
+    """Stream a response body straight into the lxml parser.
+
+    The parser consumes the socket incrementally, so peak memory is the
+    parse state rather than the full decoded HTML string.
+    """
+    response = SESSION.get(url, headers=PriceScraper.get_headers(), timeout=10, stream=True)
+    response.raw.decode_content = True
+    try:
+        return lxml.html.parse(response.raw, parser=_html_parser()).getroot()
+    finally:
+        response.close()
+
 # ==========================================
 # GLOBAL VARIABLES
 # ==========================================
-MODELS_CACHE = {}
-CATEGORY_MODELS_CACHE = {}
+# LRU-bounded: every unique scraped title can mint a model entry, so a
+# plain dict grows without limit on a long-running server
+MODELS_CACHE = LRUCache(maxsize=512)
+CATEGORY_MODELS_CACHE = LRUCache(maxsize=512)
+_MODELS_LOCK = threading.Lock()
+# Per-key training locks: concurrent misses for the same product train once
+_TRAIN_LOCKS = defaultdict(threading.Lock)
+_LOCKS_GUARD = threading.Lock()
 DF_CLEAN = None
 FIRST_DATE = None
+PRODUCT_TOKENS = []
+PRODUCT_VECTORIZER = None
+PRODUCT_MATRIX = None
+PRODUCT_ROW_SUMS = None
+PRODUCT_INDEX = {}
+CATEGORY_INDEX = {}
+PRODUCT_MEAN_PRICES = None
+PRODUCT_PRICES = {}
+PRODUCT_DAYS = {}
+NGRAM_NAMES = []
+NGRAM_VECTORIZER = None
+NGRAM_NN = None
 
 # ==========================================
 # WEB SCRAPING - Get Current Price from URL
 # ==========================================
 class PriceScraper:
     """Scrape current price from Amazon/Flipkart/Myntra."""
-    
+
+    # Merged selector strings: one DOM walk per query instead of one per selector
+    AMAZON_TITLE_CSS = '#productTitle, span#title, h1.a-size-large'
+    AMAZON_IMAGE_CSS = '#landingImage, #imgTagWrapperId img, img[data-old-hires], img.a-dynamic-image'
+    AMAZON_PRICE_CSS = (
+        'span.a-price.aok-align-center span.a-offscreen, span.a-price-whole, '
+        'span.a-price span.a-offscreen, span#priceblock_ourprice, '
+        'span#priceblock_dealprice, span.a-color-price'
+    )
+    FLIPKART_TITLE_CSS = 'span.VU-ZEz, span.B_NuCI, h1.yhB1nd span, h1'
+    FLIPKART_IMAGE_CSS = 'img._396cs4, img._2r_T1I, img.DByuf4, img.CXW8mj, div._3kidJX img'
+    FLIPKART_PRICE_CSS = (
+        'div.Nx9bqj.CxhGGd, div.Nx9bqj, div._30jeq3, div._1vC4OE, '
+        'div._3I9_wc, div.CEmiEU'
+    )
+    MYNTRA_TITLE_CSS = 'h1.pdp-name, h1.pdp-title, h1, span.pdp-name'
+    MYNTRA_IMAGE_CSS = 'img.img-responsive, picture img, img.pdp-image'
+    MYNTRA_PRICE_CSS = (
+        'span.pdp-price strong, span.pdp-price, div.pdp-price-info span, '
+        'span[data-testid="price"]'
+    )
+    META_TITLE_CSS = 'meta[property="og:title"], meta[name="title"], meta[name="twitter:title"]'
+    META_IMAGE_CSS = 'meta[property="og:image"], meta[name="twitter:image"]'
+    META_PRICE_CSS = 'meta[property="product:price:amount"]'
+
     @staticmethod
     def get_headers():
-        """Random user agent to avoid blocking."""
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        ]
-        return {
-            'User-Agent': random.choice(user_agents),
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Referer': 'https://www.google.com/',
-        }
+        """Random pre-baked header dict to avoid blocking; treat as read-only."""
+        return random.choice(_HEADER_POOL)
+
+    @staticmethod
+    def _clean_title(text, fallback_suffixes):
+        """Collapse whitespace and strip storefront suffixes from a title."""
+        title = " ".join(text.strip().split())
+        if not title:
+            return None
+        for suffix in fallback_suffixes:
+            if title.lower().endswith(suffix.lower()):
+                title = title[: -len(suffix)].strip()
+        return title
 
     @staticmethod
-    def extract_title(soup, selectors, fallback_suffixes=None):
-        """Extract product title from selectors and metadata."""
+    def extract_title(tree, css, fallback_suffixes=None):
+        """Extract product title from a merged selector and metadata."""
         fallback_suffixes = fallback_suffixes or []
 
-        for selector in selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = " ".join(title_elem.get_text().strip().split())
-                if title:
-                    for suffix in fallback_suffixes:
-                        if title.lower().endswith(suffix.lower()):
-                            title = title[: -len(suffix)].strip()
-                    return title
+        for title_elem in tree.cssselect(css):
+            title = PriceScraper._clean_title(title_elem.text_content(), fallback_suffixes)
+            if title:
+                return title
 
-        meta_selectors = [
-            'meta[property="og:title"]',
-            'meta[name="title"]',
-            'meta[name="twitter:title"]'
-        ]
-        for selector in meta_selectors:
-            meta_elem = soup.select_one(selector)
-            if meta_elem and meta_elem.get('content'):
-                title = " ".join(meta_elem.get('content').strip().split())
+        for meta_elem in tree.cssselect(PriceScraper.META_TITLE_CSS):
+            if meta_elem.get('content'):
+                title = PriceScraper._clean_title(meta_elem.get('content'), fallback_suffixes)
                 if title:
-                    for suffix in fallback_suffixes:
-                        if title.lower().endswith(suffix.lower()):
-                            title = title[: -len(suffix)].strip()
                     return title
 
-        title_elem = soup.select_one('title')
-        if title_elem:
-            title = " ".join(title_elem.get_text().strip().split())
+        for title_elem in tree.cssselect('title'):
+            title = PriceScraper._clean_title(title_elem.text_content(), fallback_suffixes)
             if title:
-                for suffix in fallback_suffixes:
-                    if title.lower().endswith(suffix.lower()):
-                        title = title[: -len(suffix)].strip()
                 return title
 
         return None
@@ -94,14 +263,9 @@ class PriceScraper:
         if not price_text:
             return None
 
-        normalized = (
-            str(price_text)
-            .replace('₹', '')
-            .replace('Rs.', '')
-            .replace('Rs', '')
-            .strip()
-        )
-        match = re.search(r'(\d[\d,]*\.?\d*)', normalized)
+        # One translate pass for the currency symbol instead of chained .replace
+        normalized = _RS_RE.sub('', str(price_text).translate(_CURRENCY_DELETE)).strip()
+        match = _PRICE_RE.search(normalized)
         if not match:
             return None
 
@@ -113,14 +277,46 @@ class PriceScraper:
             return None
 
     @staticmethod
-    def extract_price_from_ld_json(html):
+    def _walk_for_price(node):
+        """Recursively probe parsed JSON-LD for a price-like key."""
+        if isinstance(node, dict):
+            for key in ('price', 'lowPrice', 'currentPrice'):
+                if key in node:
+                    parsed = PriceScraper.parse_price(node[key])
+                    if parsed:
+                        return parsed
+            for value in node.values():
+                found = PriceScraper._walk_for_price(value)
+                if found:
+                    return found
+        elif isinstance(node, list):
+            for item in node:
+                found = PriceScraper._walk_for_price(item)
+                if found:
+                    return found
+        return None
+
+    @staticmethod
+    def extract_price_from_ld_json(html, tree=None):
         """Extract price from JSON-LD blocks when CSS selectors fail."""
-        patterns = [
-            r'"price"\s*:\s*"?(?P<price>\d[\d,]*\.?\d*)"?',
-            r'"currentPrice"\s*:\s*"?(?P<price>\d[\d,]*\.?\d*)"?'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, html)
+        # Prefer structured data: scan only the ld+json scripts instead of
+        # pattern-matching any "price" substring in megabytes of HTML
+        if tree is not None:
+            for script in tree.cssselect('script[type="application/ld+json"]'):
+                try:
+                    # orjson rejects str subclasses like lxml's text result
+                    data = orjson.loads(str(script.text_content()))
+                except orjson.JSONDecodeError:
+                    continue
+                price = PriceScraper._walk_for_price(data)
+                if price:
+                    return price
+
+        # Regex fallback when structured data is absent or malformed
+        if html is None:
+            return None
+        for pattern in (_LD_PRICE_RE, _LD_CURRENT_PRICE_RE):
+            match = pattern.search(html)
             if match:
                 parsed = PriceScraper.parse_price(match.group('price'))
                 if parsed:
@@ -138,12 +334,9 @@ class PriceScraper:
         return clean
 
     @staticmethod
-    def extract_image_url(soup, selectors):
-        """Extract product image URL from image/meta selectors."""
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if not elem:
-                continue
+    def extract_image_url(tree, css):
+        """Extract product image URL from a merged image/meta selector."""
+        for elem in tree.cssselect(css):
             src = (
                 elem.get('src')
                 or elem.get('data-src')
@@ -154,167 +347,157 @@ class PriceScraper:
             if normalized:
                 return normalized
 
-        og_image = soup.select_one('meta[property="og:image"]')
-        if og_image and og_image.get('content'):
-            return PriceScraper.normalize_image_url(og_image.get('content'))
+        for meta_elem in tree.cssselect(PriceScraper.META_IMAGE_CSS):
+            if meta_elem.get('content'):
+                return PriceScraper.normalize_image_url(meta_elem.get('content'))
+
+        return None
+
+    @staticmethod
+    def extract_first_price(tree, css):
+        """Extract first parseable price from a merged selector, document order."""
+        for price_elem in tree.cssselect(css):
+            parsed_price = PriceScraper.parse_price(price_elem.text_content().strip())
+            if parsed_price:
+                return parsed_price
 
-        twitter_image = soup.select_one('meta[name="twitter:image"]')
-        if twitter_image and twitter_image.get('content'):
-            return PriceScraper.normalize_image_url(twitter_image.get('content'))
+        for meta_price in tree.cssselect(PriceScraper.META_PRICE_CSS):
+            if meta_price.get('content'):
+                return PriceScraper.parse_price(meta_price.get('content'))
 
         return None
     
     @staticmethod
+    async def _fetch(session, url):
+        """Fetch page HTML over a shared aiohttp session."""
+        async with session.get(
+            url,
+            headers=PriceScraper.get_headers(),
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            return await response.text()
+
+    @staticmethod
+    def parse_amazon(html=None, tree=None):
+        """Extract price, title and image from Amazon product HTML."""
+        if tree is None:
+            tree = _parse_html(html)
+        title = PriceScraper.extract_title(
+            tree,
+            PriceScraper.AMAZON_TITLE_CSS,
+            fallback_suffixes=[': Amazon.in', '| Amazon.in']
+        )
+        image_url = PriceScraper.extract_image_url(tree, PriceScraper.AMAZON_IMAGE_CSS)
+
+        price = PriceScraper.extract_first_price(tree, PriceScraper.AMAZON_PRICE_CSS)
+        if not price:
+            price = PriceScraper.extract_price_from_ld_json(html, tree=tree)
+
+        return {'price': price, 'title': title, 'image_url': image_url}
+
+    @staticmethod
+    @_cached_scrape
     def scrape_amazon(url):
         """Scrape price and title from Amazon."""
         try:
-            response = requests.get(url, headers=PriceScraper.get_headers(), timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            title = PriceScraper.extract_title(soup, [
-                '#productTitle',
-                'span#title',
-                'h1.a-size-large'
-            ], fallback_suffixes=[': Amazon.in', '| Amazon.in'])
-            image_url = PriceScraper.extract_image_url(soup, [
-                '#landingImage',
-                '#imgTagWrapperId img',
-                'img[data-old-hires]',
-                'img.a-dynamic-image'
-            ])
-            # Try multiple selectors for price
-            price_selectors = [
-                'span.a-price.aok-align-center span.a-offscreen',
-                'span.a-price-whole',
-                'span.a-price span.a-offscreen',
-                'span#priceblock_ourprice',
-                'span#priceblock_dealprice',
-                'span.a-color-price'
-            ]
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text().strip()
-                    parsed_price = PriceScraper.parse_price(price_text)
-                    if parsed_price:
-                        return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            meta_price = soup.select_one('meta[property="product:price:amount"]')
-            if meta_price and meta_price.get('content'):
-                parsed_price = PriceScraper.parse_price(meta_price.get('content'))
-                if parsed_price:
-                    return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            ld_price = PriceScraper.extract_price_from_ld_json(response.text)
-            if ld_price:
-                return {'price': ld_price, 'title': title, 'image_url': image_url}
-
-            return {'price': None, 'title': title, 'image_url': image_url}
+            return PriceScraper.parse_amazon(tree=_stream_tree(url))
         except Exception as e:
-            print(f"Error scraping Amazon: {e}")
+            log.warning("Error scraping Amazon: %s", e)
             return {'price': None, 'title': None, 'image_url': None}
 
     @staticmethod
+    async def scrape_amazon_async(session, url):
+        """Async variant of scrape_amazon on a shared aiohttp session."""
+        try:
+            html = await PriceScraper._fetch(session, url)
+            # Parse on a worker thread so CPU work overlaps other fetches
+            return await _parse_in_pool(PriceScraper.parse_amazon, html)
+        except Exception as e:
+            log.warning("Error scraping Amazon: %s", e)
+            return {'price': None, 'title': None, 'image_url': None}
+
+    @staticmethod
+    def parse_flipkart(html=None, tree=None):
+        """Extract price, title and image from Flipkart product HTML."""
+        if tree is None:
+            tree = _parse_html(html)
+        title = PriceScraper.extract_title(
+            tree,
+            PriceScraper.FLIPKART_TITLE_CSS,
+            fallback_suffixes=['| Flipkart.com', '| Flipkart']
+        )
+        image_url = PriceScraper.extract_image_url(tree, PriceScraper.FLIPKART_IMAGE_CSS)
+
+        price = PriceScraper.extract_first_price(tree, PriceScraper.FLIPKART_PRICE_CSS)
+        if not price:
+            price = PriceScraper.extract_price_from_ld_json(html, tree=tree)
+
+        return {'price': price, 'title': title, 'image_url': image_url}
+
+    @staticmethod
+    @_cached_scrape
     def scrape_flipkart(url):
         """Scrape price and title from Flipkart."""
         try:
-            response = requests.get(url, headers=PriceScraper.get_headers(), timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            title = PriceScraper.extract_title(soup, [
-                'span.VU-ZEz',
-                'span.B_NuCI',
-                'h1.yhB1nd span',
-                'h1'
-            ], fallback_suffixes=['| Flipkart.com', '| Flipkart'])
-            image_url = PriceScraper.extract_image_url(soup, [
-                'img._396cs4',
-                'img._2r_T1I',
-                'img.DByuf4',
-                'img.CXW8mj',
-                'div._3kidJX img'
-            ])
-            # Try multiple selectors for price
-            price_selectors = [
-                'div.Nx9bqj.CxhGGd',
-                'div.Nx9bqj',
-                'div._30jeq3',
-                'div._1vC4OE',
-                'div._3I9_wc',
-                'div.CEmiEU'
-            ]
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text().strip()
-                    parsed_price = PriceScraper.parse_price(price_text)
-                    if parsed_price:
-                        return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            meta_price = soup.select_one('meta[property="product:price:amount"]')
-            if meta_price and meta_price.get('content'):
-                parsed_price = PriceScraper.parse_price(meta_price.get('content'))
-                if parsed_price:
-                    return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            ld_price = PriceScraper.extract_price_from_ld_json(response.text)
-            if ld_price:
-                return {'price': ld_price, 'title': title, 'image_url': image_url}
-
-            return {'price': None, 'title': title, 'image_url': image_url}
+            return PriceScraper.parse_flipkart(tree=_stream_tree(url))
+        except Exception as e:
+            log.warning("Error scraping Flipkart: %s", e)
+            return {'price': None, 'title': None, 'image_url': None}
+
+    @staticmethod
+    async def scrape_flipkart_async(session, url):
+        """Async variant of scrape_flipkart on a shared aiohttp session."""
+        try:
+            html = await PriceScraper._fetch(session, url)
+            # Parse on a worker thread so CPU work overlaps other fetches
+            return await _parse_in_pool(PriceScraper.parse_flipkart, html)
         except Exception as e:
-            print(f"Error scraping Flipkart: {e}")
+            log.warning("Error scraping Flipkart: %s", e)
             return {'price': None, 'title': None, 'image_url': None}
 
     @staticmethod
+    def parse_myntra(html=None, tree=None):
+        """Extract price, title and image from Myntra product HTML."""
+        if tree is None:
+            tree = _parse_html(html)
+        title = PriceScraper.extract_title(
+            tree,
+            PriceScraper.MYNTRA_TITLE_CSS,
+            fallback_suffixes=['| Myntra', '| Myntra.com']
+        )
+        image_url = PriceScraper.extract_image_url(tree, PriceScraper.MYNTRA_IMAGE_CSS)
+
+        price = PriceScraper.extract_first_price(tree, PriceScraper.MYNTRA_PRICE_CSS)
+        if not price:
+            price = PriceScraper.extract_price_from_ld_json(html, tree=tree)
+
+        return {'price': price, 'title': title, 'image_url': image_url}
+
+    @staticmethod
+    @_cached_scrape
     def scrape_myntra(url):
         """Scrape price and title from Myntra."""
         try:
-            response = requests.get(url, headers=PriceScraper.get_headers(), timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            title = PriceScraper.extract_title(soup, [
-                'h1.pdp-name',
-                'h1.pdp-title',
-                'h1',
-                'span.pdp-name'
-            ], fallback_suffixes=['| Myntra', '| Myntra.com'])
-            image_url = PriceScraper.extract_image_url(soup, [
-                'img.img-responsive',
-                'picture img',
-                'img.pdp-image'
-            ])
-
-            price_selectors = [
-                'span.pdp-price strong',
-                'span.pdp-price',
-                'div.pdp-price-info span',
-                'span[data-testid="price"]'
-            ]
-            for selector in price_selectors:
-                price_elem = soup.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text().strip()
-                    parsed_price = PriceScraper.parse_price(price_text)
-                    if parsed_price:
-                        return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            meta_price = soup.select_one('meta[property="product:price:amount"]')
-            if meta_price and meta_price.get('content'):
-                parsed_price = PriceScraper.parse_price(meta_price.get('content'))
-                if parsed_price:
-                    return {'price': parsed_price, 'title': title, 'image_url': image_url}
-
-            ld_price = PriceScraper.extract_price_from_ld_json(response.text)
-            if ld_price:
-                return {'price': ld_price, 'title': title, 'image_url': image_url}
-
-            return {'price': None, 'title': title, 'image_url': image_url}
+            return PriceScraper.parse_myntra(tree=_stream_tree(url))
         except Exception as e:
-            print(f"Error scraping Myntra: {e}")
+            log.warning("Error scraping Myntra: %s", e)
+            return {'price': None, 'title': None, 'image_url': None}
+
+    @staticmethod
+    async def scrape_myntra_async(session, url):
+        """Async variant of scrape_myntra on a shared aiohttp session."""
+        try:
+            html = await PriceScraper._fetch(session, url)
+            # Parse on a worker thread so CPU work overlaps other fetches
+            return await _parse_in_pool(PriceScraper.parse_myntra, html)
+        except Exception as e:
+            log.warning("Error scraping Myntra: %s", e)
             return {'price': None, 'title': None, 'image_url': None}
 
     @staticmethod
     def scrape_details(url, source):
         """Main scraping function for product details."""
-        print(f"Attempting to scrape product details from {source}...")
+        log.debug("Attempting to scrape product details from %s...", source)
         if source == 'amazon':
             details = PriceScraper.scrape_amazon(url)
         elif source == 'flipkart':
@@ -327,59 +510,144 @@ class PriceScraper:
         title = details.get('title')
         image_url = details.get('image_url')
         if price:
-            print(f"Scraped price: {price}")
+            log.debug("Scraped price: %s", price)
         else:
-            print("Could not scrape price, will use estimated price")
+            log.debug("Could not scrape price, will use estimated price")
         if title:
-            print(f"Scraped title: {title}")
+            log.debug("Scraped title: %s", title)
         else:
-            print("Could not scrape title, will use parsed product name")
+            log.debug("Could not scrape title, will use parsed product name")
         if image_url:
-            print(f"Scraped image URL: {image_url}")
+            log.debug("Scraped image URL: %s", image_url)
+        else:
+            log.debug("Could not scrape image, will use fallback")
+        return details
+
+    @staticmethod
+    async def scrape_details_async(session, url, source):
+        """Async variant of scrape_details on a shared aiohttp session."""
+        if source not in ('amazon', 'flipkart', 'myntra'):
+            return {'price': None, 'title': None, 'image_url': None}
+
+        # Keyed identically to the decorated sync scrapers
+        key = (f'scrape_{source}', url)
+        cached = _scrape_cache_get(key)
+        if cached is not None:
+            return cached
+
+        if source == 'amazon':
+            details = await PriceScraper.scrape_amazon_async(session, url)
+        elif source == 'flipkart':
+            details = await PriceScraper.scrape_flipkart_async(session, url)
         else:
-            print("Could not scrape image, will use fallback")
+            details = await PriceScraper.scrape_myntra_async(session, url)
+        _scrape_cache_put(key, details)
         return details
 
+    @staticmethod
+    def _search_request(product_name, source):
+        """Build (search_url, merged price selector) for a marketplace search."""
+        query = quote_plus(product_name)
+        if source == 'amazon':
+            return (
+                f"https://www.amazon.in/s?k={query}",
+                'span.a-price span.a-offscreen, .s-result-item span.a-price-whole'
+            )
+        if source == 'flipkart':
+            return (
+                f"https://www.flipkart.com/search?q={query}",
+                'div.Nx9bqj, div._30jeq3, div._1vC4OE'
+            )
+        return None, None
+
+    @staticmethod
+    def parse_search_price(html, css, tree=None):
+        """Extract first visible price from a search results page."""
+        if tree is None:
+            tree = _parse_html(html)
+        for elem in tree.cssselect(css):
+            parsed = PriceScraper.parse_price(elem.text_content().strip())
+            if parsed:
+                return parsed
+        return None
+
     @staticmethod
     def scrape_search_price(product_name, source):
         """Best-effort: scrape first visible price from search results page."""
+        # Normalized key so 'iPhone 15' and 'iphone 15' share a cache entry
+        key = ('scrape_search_price', product_name.strip().lower(), source)
+        cached = _scrape_cache_get(key)
+        if cached is not None:
+            return cached
         try:
-            query = quote_plus(product_name)
-            if source == 'amazon':
-                search_url = f"https://www.amazon.in/s?k={query}"
-                selectors = [
-                    'span.a-price span.a-offscreen',
-                    '.s-result-item span.a-price-whole'
-                ]
-            elif source == 'flipkart':
-                search_url = f"https://www.flipkart.com/search?q={query}"
-                selectors = [
-                    'div.Nx9bqj',
-                    'div._30jeq3',
-                    'div._1vC4OE'
-                ]
-            else:
+            search_url, selector_css = PriceScraper._search_request(product_name, source)
+            if not search_url:
                 return None
 
-            response = requests.get(search_url, headers=PriceScraper.get_headers(), timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            for selector in selectors:
-                elem = soup.select_one(selector)
-                if elem:
-                    parsed = PriceScraper.parse_price(elem.get_text().strip())
-                    if parsed:
-                        return parsed
+            result = PriceScraper.parse_search_price(None, selector_css, tree=_stream_tree(search_url))
+            _scrape_cache_put(key, result)
+            return result
+        except Exception:
             return None
+
+    @staticmethod
+    async def scrape_search_price_async(session, product_name, source):
+        """Async variant of scrape_search_price on a shared aiohttp session."""
+        key = ('scrape_search_price', product_name.strip().lower(), source)
+        cached = _scrape_cache_get(key)
+        if cached is not None:
+            return cached
+        try:
+            search_url, selector_css = PriceScraper._search_request(product_name, source)
+            if not search_url:
+                return None
+
+            html = await PriceScraper._fetch(session, search_url)
+            result = await _parse_in_pool(PriceScraper.parse_search_price, html, selector_css)
+            _scrape_cache_put(key, result)
+            return result
         except Exception:
             return None
 
+    @staticmethod
+    async def gather_analyze_scrapes(url, source, product_name, other_source):
+        """Fetch product details and the other marketplace's search price concurrently."""
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SCRAPES)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        async with aiohttp.ClientSession() as session:
+            tasks = [bounded(PriceScraper.scrape_details_async(session, url, source))]
+            if other_source:
+                tasks.append(bounded(
+                    PriceScraper.scrape_search_price_async(session, product_name, other_source)
+                ))
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        details = results[0]
+        if isinstance(details, Exception):
+            details = {'price': None, 'title': None, 'image_url': None}
+        other_price = None
+        if other_source and not isinstance(results[1], Exception):
+            other_price = results[1]
+        return details, other_price
+
+    @staticmethod
+    async def gather_marketplace_prices(product_name):
+        """Fetch Amazon and Flipkart search prices concurrently."""
+        async with aiohttp.ClientSession() as session:
+            amazon_price, flipkart_price = await asyncio.gather(
+                PriceScraper.scrape_search_price_async(session, product_name, 'amazon'),
+                PriceScraper.scrape_search_price_async(session, product_name, 'flipkart')
+            )
+        return {'amazon': amazon_price, 'flipkart': flipkart_price}
+
     @staticmethod
     def get_marketplace_prices(product_name):
         """Fetch Amazon and Flipkart current prices by product-name search."""
-        return {
-            'amazon': PriceScraper.scrape_search_price(product_name, 'amazon'),
-            'flipkart': PriceScraper.scrape_search_price(product_name, 'flipkart')
-        }
+        return asyncio.run(PriceScraper.gather_marketplace_prices(product_name))
 
     @staticmethod
     def infer_product_name_from_url(url, source):
@@ -390,9 +658,9 @@ class PriceScraper:
 
             def prettify(segment):
                 clean = unquote(segment or '')
-                clean = re.sub(r'[^a-zA-Z0-9\-\+ ]', ' ', clean)
+                clean = _SLUG_RE.sub(' ', clean)
                 clean = clean.replace('-', ' ').replace('+', ' ')
-                clean = re.sub(r'\s+', ' ', clean).strip()
+                clean = _WS_RE.sub(' ', clean).strip()
                 if not clean:
                     return None
                 return " ".join(word.capitalize() for word in clean.split())
@@ -431,12 +699,76 @@ class PriceScraper:
 # ==========================================
 # SMART PRODUCT MATCHING
 # ==========================================
+# Category keywords; dict order is the precedence for ambiguous words
+# (e.g. 'watch' counts as electronics before fashion)
+CATEGORY_KEYWORDS = {
+    'electronics': ['phone', 'laptop', 'tablet', 'watch', 'earphone', 'headphone',
+                    'camera', 'tv', 'monitor', 'keyboard', 'mouse', 'speaker'],
+    'fashion': ['shirt', 'jeans', 'shoe', 'dress', 'jacket', 'trouser', 'bag',
+                'sunglasses', 'watch', 'belt', 'hat'],
+    'home': ['furniture', 'bed', 'sofa', 'chair', 'table', 'lamp', 'curtain',
+             'vacuum', 'mixer', 'blender', 'kettle'],
+    'books': ['book', 'novel', 'diary', 'notebook', 'pen', 'pencil'],
+    'sports': ['gym', 'fitness', 'yoga', 'dumbbell', 'treadmill', 'cycle']
+}
+
+# Single automaton over all category keywords: one C-level scan of the
+# name replaces the nested categories x keywords substring loops
+_CATEGORY_PRECEDENCE = {cat: rank for rank, cat in enumerate(CATEGORY_KEYWORDS)}
+_CATEGORY_AUTOMATON = ahocorasick.Automaton()
+for _cat, _keywords in CATEGORY_KEYWORDS.items():
+    for _kw in _keywords:
+        if _kw not in _CATEGORY_AUTOMATON:
+            _CATEGORY_AUTOMATON.add_word(_kw, _cat)
+_CATEGORY_AUTOMATON.make_automaton()
+
+# Common and noisy words excluded from keyword matching
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'with', 'without', 'by', 'from', 'best', 'price', 'online',
+    'storage', 'ram', 'gb', 'tb', 'inch', 'cm', 'mm', 'new',
+    'amazon', 'flipkart', 'myntra', 'product', 'india', 'buy'
+})
+
+def _tokens(normalized_text):
+    """Keyword tokens from already-normalized text."""
+    return [w for w in normalized_text.split() if w not in STOP_WORDS and len(w) > 2]
+
+_LEV_TLS = threading.local()
+
+def _levenshtein(a, b):
+    """Edit distance with one reusable rolling row instead of a full matrix."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    n = len(b)
+    if n == 0:
+        return len(a)
+
+    row = getattr(_LEV_TLS, 'row', None)
+    if row is None or len(row) < n + 1:
+        row = [0] * (n + 1)
+        _LEV_TLS.row = row
+    for j in range(n + 1):
+        row[j] = j
+
+    for i, char_a in enumerate(a, 1):
+        diag = row[0]
+        row[0] = i
+        for j, char_b in enumerate(b, 1):
+            cost = diag + (char_a != char_b)
+            diag = row[j]
+            row[j] = min(cost, diag + 1, row[j - 1] + 1)
+    return row[n]
+
 class SmartMatcher:
     """Match ANY product to similar products in dataset."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def normalize_text(text):
-        """Normalize product text for better matching."""
+        """Normalize product text for better matching (memoized)."""
         if not text:
             return ""
 
@@ -453,53 +785,95 @@ class SmartMatcher:
         for phrase in noise_phrases:
             cleaned = cleaned.replace(phrase, ' ')
 
-        cleaned = re.sub(r'[^a-z0-9\s]', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _NON_ALNUM_RE.sub(' ', cleaned)
+        cleaned = _WS_RE.sub(' ', cleaned).strip()
         return cleaned
 
     @staticmethod
     def extract_keywords(product_name):
         """Extract important keywords from product name."""
-        # Remove common and noisy words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'with', 'without', 'by', 'from', 'best', 'price', 'online',
-            'storage', 'ram', 'gb', 'tb', 'inch', 'cm', 'mm', 'new',
-            'amazon', 'flipkart', 'myntra', 'product', 'india', 'buy'
-        }
-        words = SmartMatcher.normalize_text(product_name).split()
-        keywords = [w for w in words if w not in stop_words and len(w) > 2]
-        return keywords
+        return _tokens(SmartMatcher.normalize_text(product_name))
 
     @staticmethod
     def is_generic_product_name(product_name):
         """Detect placeholder names that should not drive model matching."""
         normalized = SmartMatcher.normalize_text(product_name)
-        return normalized in {
-            'amazon product',
-            'flipkart product',
-            'myntra product',
-            'product'
-        }
+        return _GENERIC_NAME_RE.fullmatch(normalized) is not None
     
+    @staticmethod
+    def build_token_index(product_names):
+        """Precompute (name, normalized, keyword set) for product names."""
+        index = []
+        for name in product_names:
+            norm = SmartMatcher.normalize_text(name)
+            tokens = frozenset(_tokens(norm))
+            if tokens:
+                index.append((name, norm, tokens))
+        return index
+
+    @staticmethod
+    def _containment_bonus(product_norm, query_norm, keywords):
+        """Brand/model bonus for substring containment."""
+        bonus = 0.0
+        if any(tok in product_norm for tok in list(keywords)[:2]):
+            bonus += 1.0
+        if product_norm in query_norm or query_norm in product_norm:
+            bonus += 1.0
+        return bonus
+
+    @staticmethod
+    def _find_similar_vectorized(product_name, query_norm, keywords, top_n, min_score):
+        """Score all products at once via the sparse keyword matrix."""
+        query_vec = PRODUCT_VECTORIZER.transform([product_name])
+        overlap = (PRODUCT_MATRIX @ query_vec.T).toarray().ravel().astype(np.float64)
+        union = PRODUCT_ROW_SUMS + len(keywords) - overlap
+        jaccard = overlap / np.maximum(union, 1)
+        score = (overlap * 1.5) + (jaccard * 5.0)
+
+        # Narrow to top candidates without a full sort, then add the
+        # per-candidate containment bonuses that need string checks.
+        k = min(top_n * 4, score.size)
+        if score.size > k:
+            candidates = np.argpartition(-score, k - 1)[:k]
+        else:
+            candidates = np.arange(score.size)
+
+        scores = []
+        for i in candidates:
+            if overlap[i] == 0:
+                continue
+            product, product_norm, _ = PRODUCT_TOKENS[i]
+            final = score[i] + SmartMatcher._containment_bonus(product_norm, query_norm, keywords)
+            if final >= min_score:
+                scores.append((product, final))
+
+        similar = sorted(scores, key=lambda x: x[1], reverse=True)
+        return [p[0] for p in similar[:top_n]]
+
     @staticmethod
     def find_similar_products(product_name, df, top_n=10, min_score=2.0):
         """Find similar products using weighted keyword overlap."""
-        keywords = set(SmartMatcher.extract_keywords(product_name))
-        
+        keywords = frozenset(SmartMatcher.extract_keywords(product_name))
+
         if not keywords:
-            return []
-        
+            return SmartMatcher.find_similar_by_ngrams(product_name, top_n=top_n)
+
         query_norm = SmartMatcher.normalize_text(product_name)
-        products = df['product_name'].unique()
+
+        if PRODUCT_MATRIX is not None:
+            results = SmartMatcher._find_similar_vectorized(
+                product_name, query_norm, keywords, top_n, min_score
+            )
+            if results:
+                return results
+            # Keyword overlap found nothing; char ngrams still match typos
+            return SmartMatcher.find_similar_by_ngrams(product_name, top_n=top_n)
+
+        # Fallback for ad-hoc dataframes without the prebuilt index
+        index = PRODUCT_TOKENS or SmartMatcher.build_token_index(df['product_name'].unique())
         scores = []
-        
-        for product in products:
-            product_norm = SmartMatcher.normalize_text(product)
-            product_tokens = set(SmartMatcher.extract_keywords(product_norm))
-            if not product_tokens:
-                continue
 
+        for product, product_norm, product_tokens in index:
             overlap = keywords.intersection(product_tokens)
             if not overlap:
                 continue
@@ -507,39 +881,58 @@ class SmartMatcher:
             union = keywords.union(product_tokens)
             jaccard = len(overlap) / len(union) if union else 0
 
-            # Brand/model bonus for substring containment
-            direct_bonus = 1.0 if any(tok in product_norm for tok in list(keywords)[:2]) else 0.0
-            phrase_bonus = 1.0 if product_norm in query_norm or query_norm in product_norm else 0.0
-
-            score = (len(overlap) * 1.5) + (jaccard * 5.0) + direct_bonus + phrase_bonus
+            score = (len(overlap) * 1.5) + (jaccard * 5.0)
+            score += SmartMatcher._containment_bonus(product_norm, query_norm, keywords)
             if score >= min_score:
                 scores.append((product, score))
-        
+
         # Sort by score
         similar = sorted(scores, key=lambda x: x[1], reverse=True)
         return [p[0] for p in similar[:top_n]]
+
+    @staticmethod
+    def find_similar_by_ngrams(product_name, top_n=5, max_distance=0.6):
+        """Typo-tolerant lookup over the prebuilt char-ngram index."""
+        if NGRAM_NN is None or not NGRAM_NAMES:
+            return []
+
+        query_vec = NGRAM_VECTORIZER.transform([product_name])
+        if query_vec.nnz == 0:
+            return []
+
+        n_neighbors = min(top_n, len(NGRAM_NAMES))
+        distances, indices = NGRAM_NN.kneighbors(query_vec, n_neighbors=n_neighbors)
+        candidates = [
+            NGRAM_NAMES[idx]
+            for dist, idx in zip(distances[0], indices[0])
+            if dist <= max_distance
+        ]
+
+        # Cosine over ngrams is order-insensitive; break ties by edit distance
+        if len(candidates) > 1:
+            query_lower = product_name.lower()[:64]
+            candidates.sort(key=lambda name: _levenshtein(query_lower, name.lower()[:64]))
+        return candidates
     
     @staticmethod
     def get_category_from_name(product_name):
         """Determine category from product name."""
-        product_lower = product_name.lower()
-        
-        categories = {
-            'electronics': ['phone', 'laptop', 'tablet', 'watch', 'earphone', 'headphone', 
-                          'camera', 'tv', 'monitor', 'keyboard', 'mouse', 'speaker'],
-            'fashion': ['shirt', 'jeans', 'shoe', 'dress', 'jacket', 'trouser', 'bag',
-                       'sunglasses', 'watch', 'belt', 'hat'],
-            'home': ['furniture', 'bed', 'sofa', 'chair', 'table', 'lamp', 'curtain',
-                    'vacuum', 'mixer', 'blender', 'kettle'],
-            'books': ['book', 'novel', 'diary', 'notebook', 'pen', 'pencil'],
-            'sports': ['gym', 'fitness', 'yoga', 'dumbbell', 'treadmill', 'cycle']
-        }
-        
-        for category, keywords in categories.items():
-            if any(kw in product_lower for kw in keywords):
-                return category
-        
-        return 'general'
+        # Cap the key so long scraped titles can't bloat the lru_cache
+        return SmartMatcher._category_for(product_name[:128].lower())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _category_for(product_lower):
+        """Memoized keyword scan over a normalized (lowercase) name."""
+        best = None
+        for _, category in _CATEGORY_AUTOMATON.iter(product_lower):
+            rank = _CATEGORY_PRECEDENCE[category]
+            if best is None or rank < best[0]:
+                best = (rank, category)
+                if rank == 0:
+                    break
+
+        return best[1] if best else 'general'
 
 # ==========================================
 # DATA PREPROCESSING (from previous code)
@@ -547,79 +940,169 @@ class SmartMatcher:
 def load_and_preprocess_data(filepath):
     """Load and clean the dataset."""
     try:
-        df = pd.read_csv(filepath)
-        df = df[['Description', 'InvoiceDate', 'UnitPrice']].copy()
+        # pyarrow parses the CSV in multi-threaded C instead of the default engine
+        df = pd.read_csv(
+            filepath,
+            engine='pyarrow',
+            usecols=['Description', 'InvoiceDate', 'UnitPrice'],
+            parse_dates=['InvoiceDate']
+        )
+        df = df[['Description', 'InvoiceDate', 'UnitPrice']]
         df.columns = ['product_name', 'date', 'price']
         df = df.dropna()
-        df['date'] = pd.to_datetime(df['date'])
         df = df[df['price'] > 0]
+        # Categorical interning: downstream groupby/unique/filter become integer-keyed
+        df['product_name'] = df['product_name'].astype('category')
+        df['price'] = df['price'].astype('float32')
         df = df.sort_values('date')
-        
+
         first_date = df['date'].min()
-        df['days_since_start'] = (df['date'] - first_date).dt.days
-        
+        df['days_since_start'] = (df['date'] - first_date).dt.days.astype('int32')
+
         return df, first_date
     except Exception as e:
-        print(f"Error loading data: {e}")
+        log.error("Error loading data: %s", e)
         raise
 
-def aggregate_by_product_and_date(df):
-    """Aggregate data by product and date."""
-    df_agg = df.groupby(['product_name', 'date', 'days_since_start']).agg({
-        'price': 'mean'
-    }).reset_index()
+def aggregate_by_product_and_date(df, first_date):
+    """Aggregate data by product and day."""
+    # 'date' is fully determined by first_date + days_since_start, so keep it
+    # out of the groupby key and reattach it afterwards
+    df_agg = (
+        df.groupby(['product_name', 'days_since_start'], observed=True, sort=False)['price']
+        .mean()
+        .reset_index()
+    )
+    df_agg['date'] = first_date + pd.to_timedelta(df_agg['days_since_start'], unit='D')
     return df_agg
 
+def load_dataset(filepath):
+    """Load the dataset and rebuild all derived caches and indexes."""
+    global DF_CLEAN, FIRST_DATE, MODELS_CACHE, CATEGORY_MODELS_CACHE
+    global PRODUCT_TOKENS, PRODUCT_VECTORIZER, PRODUCT_MATRIX, PRODUCT_ROW_SUMS
+    global PRODUCT_INDEX, CATEGORY_INDEX, PRODUCT_MEAN_PRICES
+    global PRODUCT_PRICES, PRODUCT_DAYS
+    global NGRAM_NAMES, NGRAM_VECTORIZER, NGRAM_NN
+
+    df, first_date = load_and_preprocess_data(filepath)
+    DF_CLEAN = aggregate_by_product_and_date(df, first_date)
+    FIRST_DATE = first_date
+
+    # Categorize each unique name once and broadcast with .map, instead of
+    # running the keyword matcher over every row per category-model miss
+    category_map = {
+        name: SmartMatcher.get_category_from_name(name)
+        for name in DF_CLEAN['product_name'].unique()
+    }
+    DF_CLEAN['category'] = (
+        DF_CLEAN['product_name'].map(category_map).astype('category')
+    )
+
+    # Per-product positional indices: O(1) lookup + O(k) gather instead of
+    # materializing a sub-frame per product up front
+    PRODUCT_INDEX = DF_CLEAN.groupby('product_name', sort=False, observed=True).indices
+    CATEGORY_INDEX = DF_CLEAN.groupby('category', sort=False, observed=True).indices
+    PRODUCT_MEAN_PRICES = DF_CLEAN.groupby('product_name', observed=True)['price'].mean()
+
+    # Struct-of-arrays history per product: contiguous float64 arrays keep the
+    # request path off pandas indexing entirely
+    all_prices = DF_CLEAN['price'].to_numpy(dtype=np.float64)
+    all_days = DF_CLEAN['days_since_start'].to_numpy(dtype=np.float64)
+    PRODUCT_PRICES = {
+        name: np.ascontiguousarray(all_prices[idx]) for name, idx in PRODUCT_INDEX.items()
+    }
+    PRODUCT_DAYS = {
+        name: np.ascontiguousarray(all_days[idx]) for name, idx in PRODUCT_INDEX.items()
+    }
+
+    MODELS_CACHE = LRUCache(maxsize=512)
+    CATEGORY_MODELS_CACHE = LRUCache(maxsize=512)
+    PRODUCT_TOKENS = SmartMatcher.build_token_index(DF_CLEAN['product_name'].unique())
+
+    # Sparse binary keyword matrix over the token index for vectorized scoring
+    PRODUCT_VECTORIZER = CountVectorizer(
+        analyzer=SmartMatcher.extract_keywords,
+        binary=True
+    )
+    PRODUCT_MATRIX = PRODUCT_VECTORIZER.fit_transform([t[0] for t in PRODUCT_TOKENS])
+    PRODUCT_ROW_SUMS = np.asarray(PRODUCT_MATRIX.sum(axis=1)).ravel().astype(np.float64)
+
+    # Char-ngram index: typo-tolerant fallback for names keyword overlap misses
+    NGRAM_NAMES = [t[0] for t in PRODUCT_TOKENS]
+    NGRAM_VECTORIZER = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 5), lowercase=True)
+    ngram_matrix = NGRAM_VECTORIZER.fit_transform(NGRAM_NAMES)
+    NGRAM_NN = NearestNeighbors(n_neighbors=5, metric='cosine').fit(ngram_matrix)
+
+def fit_linear_trend(x, y):
+    """Closed-form 1-D least squares fit: returns (slope, intercept, r2)."""
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+
+    denom = (dx * dx).sum()
+    slope = (dx * dy).sum() / denom if denom else 0.0
+    intercept = y_mean - slope * x_mean
+
+    ss_res = ((y - (intercept + slope * x)) ** 2).sum()
+    ss_tot = (dy * dy).sum()
+    r2 = 1.0 - ss_res / ss_tot if ss_tot else 1.0
+
+    return float(slope), float(intercept), float(r2)
+
 def train_price_model(df, product_name):
-    """Train Linear Regression model for a product."""
-    product_data = df[df['product_name'] == product_name].copy()
-    
-    if len(product_data) < 5:
+    """Fit a linear price trend for a product."""
+    x = PRODUCT_DAYS.get(product_name)
+    y = PRODUCT_PRICES.get(product_name)
+    if x is None:
+        mask = df['product_name'] == product_name
+        x = df.loc[mask, 'days_since_start'].to_numpy(dtype=np.float64)
+        y = df.loc[mask, 'price'].to_numpy(dtype=np.float64)
+
+    if len(y) < 5:
         raise ValueError(f"Not enough data for {product_name}")
-    
-    X = product_data[['days_since_start']].values
-    y = product_data['price'].values
-    
-    model = LinearRegression()
-    model.fit(X, y)
-    
+
+    slope, intercept, r2 = fit_linear_trend(x, y)
+
     return {
-        'model': model,
-        'data': product_data,
-        'r2': model.score(X, y),
-        'slope': model.coef_[0]
+        'prices': y,
+        'mean_price': float(y.mean()),
+        'r2': r2,
+        'slope': slope,
+        'intercept': intercept,
+        'last_day': int(x[-1])
     }
 
-def predict_future_prices(model, current_day, future_days=[7, 15, 30, 60, 90, 120, 150, 180, 210]):
-    """Predict prices for future dates."""
-    predictions = {}
-    for days_ahead in future_days:
-        future_day = current_day + days_ahead
-        predicted_price = model.predict([[future_day]])[0]
-        predictions[f'{days_ahead}_days'] = float(max(0, predicted_price))  # Ensure positive
-    return predictions
+def predict_price_array(model_info, current_day, future_days):
+    """Evaluate the fitted trend for all horizons in one vectorized shot."""
+    days = np.asarray(future_days, dtype=np.float64)
+    predicted = model_info['intercept'] + model_info['slope'] * (current_day + days)
+    return np.maximum(0, predicted)  # Ensure positive
+
+def predict_future_prices(model_info, current_day, future_days=[7, 15, 30, 60, 90, 120, 150, 180, 210], scale=1.0):
+    """Predict prices for future dates from the fitted linear trend."""
+    predicted = predict_price_array(model_info, current_day, future_days)
+    if scale != 1.0:
+        predicted = predicted * scale
+    return {
+        f'{days_ahead}_days': float(price)
+        for days_ahead, price in zip(future_days, predicted)
+    }
 
 def make_buying_decision(current_price, predictions, threshold=0.05):
     """Decide BUY NOW or WAIT."""
-    should_wait = False
-    best_time = None
-    max_savings = 0
-    
-    for period, predicted_price in predictions.items():
-        days_ahead = int(period.split('_')[0])
-        price_diff = current_price - predicted_price
-        
-        if price_diff > max_savings:
-            max_savings = price_diff
-            best_time = days_ahead
-        
-        if (price_diff / current_price) > threshold:
-            should_wait = True
-    
+    days = np.array([int(period.split('_')[0]) for period in predictions])
+    predicted = np.fromiter(predictions.values(), dtype=np.float64, count=len(predictions))
+    diffs = current_price - predicted
+
+    best = int(diffs.argmax())
+    max_savings = float(max(0, diffs[best]))
+    should_wait = bool(((diffs / current_price) > threshold).any())
+
     return {
         'action': 'WAIT' if should_wait and max_savings > 0 else 'BUY_NOW',
-        'savings': float(max(0, max_savings)),
-        'best_time_days': best_time if should_wait else None
+        'savings': max_savings,
+        'best_time_days': int(days[best]) if should_wait else None
     }
 
 # ==========================================
@@ -657,42 +1140,54 @@ def analyze_product():
         if DF_CLEAN is None:
             return jsonify({'error': 'Dataset not loaded. Please initialize the system.'}), 500
         
-        print(f"\n{'='*60}")
-        print(f"Analyzing: {product_name}")
-        print(f"Source: {source}")
-        print(f"{'='*60}")
-        
+        log.debug("Analyzing: %s (source: %s)", product_name, source)
+
+        # Debug escape hatch: ?nocache=1 forces fresh scrapes for this request
+        _CACHE_BYPASS.active = request.args.get('nocache') == '1'
+
         # STEP 1: Try to scrape current price from URL
         scraped_price = None
         scraped_title = None
         scraped_image_url = None
         marketplace_prices = {'amazon': None, 'flipkart': None}
         if url and source in ['amazon', 'flipkart', 'myntra']:
-            details = PriceScraper.scrape_details(url, source)
+            # Resolve placeholder names like "Amazon Product" from the URL slug
+            # first (pure parsing, no I/O) so the concurrent cross-marketplace
+            # search never queries for the literal placeholder
+            if SmartMatcher.is_generic_product_name(product_name):
+                inferred_name = PriceScraper.infer_product_name_from_url(url, source)
+                if inferred_name:
+                    log.debug("Inferred product name from URL: %s", inferred_name)
+                    product_name = inferred_name
+
+            # Fire the product-page scrape and the other marketplace's search
+            # together: wall time is max() of the two, not their sum
+            other_source = {'amazon': 'flipkart', 'flipkart': 'amazon'}.get(source)
+            if SmartMatcher.is_generic_product_name(product_name):
+                # Inference failed; a search for the placeholder would return
+                # an arbitrary first price and poison the cache
+                other_source = None
+            details, other_price = asyncio.run(
+                PriceScraper.gather_analyze_scrapes(url, source, product_name, other_source)
+            )
             scraped_price = details.get('price')
             scraped_title = details.get('title')
             scraped_image_url = details.get('image_url')
+            log.debug("Scraped from %s: price=%s, title=%s", source, scraped_price, scraped_title)
             if source in ['amazon', 'flipkart'] and scraped_price:
                 marketplace_prices[source] = scraped_price
+            if other_source and marketplace_prices.get(other_source) is None:
+                marketplace_prices[other_source] = other_price
 
         # Prefer scraped title for frontend display
         if scraped_title:
             product_name = scraped_title
-        elif url and source in ['amazon', 'flipkart', 'myntra'] and SmartMatcher.is_generic_product_name(product_name):
-            inferred_name = PriceScraper.infer_product_name_from_url(url, source)
-            if inferred_name:
-                print(f"Inferred product name from URL: {inferred_name}")
-                product_name = inferred_name
 
         # If input is a product name, fetch both marketplace prices
         if source == 'query':
             searched_prices = PriceScraper.get_marketplace_prices(product_name)
             marketplace_prices['amazon'] = searched_prices.get('amazon')
             marketplace_prices['flipkart'] = searched_prices.get('flipkart')
-        elif source in ['amazon', 'flipkart']:
-            other_source = 'flipkart' if source == 'amazon' else 'amazon'
-            if marketplace_prices.get(other_source) is None:
-                marketplace_prices[other_source] = PriceScraper.scrape_search_price(product_name, other_source)
 
         observed_market_prices = [
             p for p in marketplace_prices.values()
@@ -708,7 +1203,7 @@ def analyze_product():
         similar_products = SmartMatcher.find_similar_products(product_name, DF_CLEAN, top_n=5)
         
         if similar_products:
-            print(f"Found {len(similar_products)} similar products")
+            log.debug("Found %d similar products", len(similar_products))
             # Use the best match
             matched_product = similar_products[0]
             model_info = get_or_train_model(matched_product)
@@ -717,12 +1212,12 @@ def analyze_product():
             # STEP 3: Fallback to nearest-price product, then category-based prediction
             nearest_product = get_nearest_product_by_price(target_price_for_fallback)
             if nearest_product:
-                print(f"No text match. Using nearest-price product model: {nearest_product}")
+                log.debug("No text match. Using nearest-price product model: %s", nearest_product)
                 matched_product = nearest_product
                 model_info = get_or_train_model(matched_product)
                 model_source = 'price_nearest_product'
             else:
-                print("No similar products found, using category average")
+                log.debug("No similar products found, using category average")
                 category = SmartMatcher.get_category_from_name(product_name)
                 model_info = get_or_train_category_model(category, target_price=scraped_price)
                 if scraped_price:
@@ -732,51 +1227,48 @@ def analyze_product():
                     matched_product = f"{category.title()} Category"
                     model_source = 'category'
         
-        product_data = model_info['data']
-        model = model_info['model']
-        
         # STEP 4: Determine current price
         available_market_prices = observed_market_prices
 
         if scraped_price:
             current_price = scraped_price
-            print(f"Using scraped price: {current_price}")
+            log.debug("Using scraped price: %s", current_price)
         elif available_market_prices:
             current_price = float(np.mean(available_market_prices))
-            print(f"Using marketplace average price: {current_price}")
+            log.debug("Using marketplace average price: %s", current_price)
         else:
             # Use average from similar products
-            current_price = float(product_data['price'].mean())
-            print(f"Using estimated price: {current_price}")
+            current_price = model_info['mean_price']
+            log.debug("Using estimated price: %s", current_price)
 
-        # STEP 5: Get current day (use latest from dataset)
-        current_day = int(product_data.iloc[-1]['days_since_start'])
-        
-        # STEP 6: Predict future prices
+        # STEP 5: Get current day (cached on the model at fit time)
+        current_day = model_info['last_day']
+
+        # STEP 6/7: Predict future prices, rescaled to the actual current
+        # price inside the vectorized predict instead of a second dict pass
+        scale_factor = 1.0
+        if scraped_price:
+            scale_factor = current_price / model_info['mean_price']
         predictions = predict_future_prices(
-            model,
+            model_info,
             current_day,
-            future_days=[7, 15, 30, 60, 90, 120, 150, 180, 210]
+            future_days=[7, 15, 30, 60, 90, 120, 150, 180, 210],
+            scale=scale_factor
         )
-        
-        # STEP 7: Adjust predictions based on actual current price
-        # Scale predictions relative to current price
-        if scraped_price:
-            avg_historical_price = float(product_data['price'].mean())
-            scale_factor = current_price / avg_historical_price
-            predictions = {k: v * scale_factor for k, v in predictions.items()}
-        
+
         # STEP 8: Make buying decision
         recommendation = make_buying_decision(current_price, predictions)
         recommendation['confidence'] = float(model_info.get('r2', 0.70))
         
-        # STEP 9: Calculate statistics
-        prices = product_data['price'].values
+        # STEP 9: Calculate statistics (one contiguous array, reused moments)
+        prices = model_info['prices']
+        price_mean = model_info['mean_price']
+        price_std = prices.std()
         statistics = {
-            'avg_price': float(np.mean(prices)),
-            'min_price': float(np.min(prices)),
-            'max_price': float(np.max(prices)),
-            'volatility': calculate_volatility(prices),
+            'avg_price': float(price_mean),
+            'min_price': float(prices.min()),
+            'max_price': float(prices.max()),
+            'volatility': calculate_volatility(price_mean, price_std, len(prices)),
             'r2_score': float(model_info.get('r2', 0.70)),
             'trend': 'decreasing' if model_info.get('slope', 0) < 0 else 'increasing'
         }
@@ -784,13 +1276,11 @@ def analyze_product():
         # STEP 10: Generate product image URL
         image_url = scraped_image_url or generate_product_image_url(product_name, source)
         
-        print("\nAnalysis complete")
-        print(f"  Current Price: {current_price}")
-        print(f"  Recommendation: {recommendation['action']}")
-        print(f"  Model Source: {model_source}")
+        log.debug("Analysis complete: price=%s, action=%s, model=%s",
+                  current_price, recommendation['action'], model_source)
         
         # Return response
-        return jsonify({
+        return _json_response({
             'success': True,
             'product': {
                 'name': product_name,
@@ -810,8 +1300,7 @@ def analyze_product():
         })
         
     except Exception as e:
-        print(f"Error in analyze_product: {e}")
-        print(traceback.format_exc())
+        log.error("Error in analyze_product: %s\n%s", e, traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/products', methods=['GET'])
@@ -830,7 +1319,7 @@ def get_available_products():
             for name, count in product_counts.head(50).items()
         ]
         
-        return jsonify({
+        return _json_response({
             'total_products': len(product_counts),
             'products': products
         })
@@ -841,20 +1330,13 @@ def get_available_products():
 @app.route('/api/initialize', methods=['POST'])
 def initialize_system():
     """Initialize the system with dataset."""
-    global DF_CLEAN, FIRST_DATE, MODELS_CACHE, CATEGORY_MODELS_CACHE
-    
     try:
         data = request.get_json()
         filepath = data.get('filepath', 'data.csv')
-        
-        print(f"Loading data from {filepath}...")
-        df, first_date = load_and_preprocess_data(filepath)
-        DF_CLEAN = aggregate_by_product_and_date(df)
-        FIRST_DATE = first_date
-        
-        MODELS_CACHE = {}
-        CATEGORY_MODELS_CACHE = {}
-        
+
+        log.info("Loading data from %s...", filepath)
+        load_dataset(filepath)
+
         return jsonify({
             'success': True,
             'message': 'System initialized successfully',
@@ -863,7 +1345,7 @@ def initialize_system():
         })
         
     except Exception as e:
-        print(f"Error initializing system: {e}")
+        log.error("Error initializing system: %s", e)
         return jsonify({'error': str(e)}), 500
 
 # ==========================================
@@ -871,11 +1353,23 @@ def initialize_system():
 # ==========================================
 def get_or_train_model(product_name):
     """Get cached model or train new one."""
-    if product_name in MODELS_CACHE:
-        return MODELS_CACHE[product_name]
-    
-    model_info = train_price_model(DF_CLEAN, product_name)
-    MODELS_CACHE[product_name] = model_info
+    with _MODELS_LOCK:
+        cached = MODELS_CACHE.get(product_name)
+    if cached is not None:
+        return cached
+
+    with _LOCKS_GUARD:
+        train_lock = _TRAIN_LOCKS[('product', product_name)]
+    with train_lock:
+        # Double-check: another thread may have trained while we waited
+        with _MODELS_LOCK:
+            cached = MODELS_CACHE.get(product_name)
+        if cached is not None:
+            return cached
+
+        model_info = train_price_model(DF_CLEAN, product_name)
+        with _MODELS_LOCK:
+            MODELS_CACHE[product_name] = model_info
     return model_info
 
 def get_or_train_category_model(category, target_price=None):
@@ -885,72 +1379,76 @@ def get_or_train_category_model(category, target_price=None):
         bucket_key = int(target_price // 5000)  # 5k INR buckets
     cache_key = f"{category}:{bucket_key}" if bucket_key is not None else category
 
-    if cache_key in CATEGORY_MODELS_CACHE:
-        return CATEGORY_MODELS_CACHE[cache_key]
-    
-    # Train on category data
-    df_category = DF_CLEAN.copy()
-    df_category['category'] = df_category['product_name'].apply(
-        lambda x: SmartMatcher.get_category_from_name(x)
-    )
-    
-    category_data = df_category[df_category['category'] == category]
-
-    # Narrow to similar price band if current price is known
-    if target_price and target_price > 0 and len(category_data) > 0:
-        means = category_data.groupby('product_name')['price'].mean().reset_index()
-        lower = target_price * 0.6
-        upper = target_price * 1.4
-        matched_names = means[(means['price'] >= lower) & (means['price'] <= upper)]['product_name'].tolist()
-        if len(matched_names) >= 2:
-            category_data = category_data[category_data['product_name'].isin(matched_names)]
-    
-    if len(category_data) < 10:
-        # Fallback to all data
-        category_data = DF_CLEAN
+    with _MODELS_LOCK:
+        cached = CATEGORY_MODELS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with _LOCKS_GUARD:
+        train_lock = _TRAIN_LOCKS[('category', cache_key)]
+    with train_lock:
+        # Double-check: another thread may have trained while we waited
+        with _MODELS_LOCK:
+            cached = CATEGORY_MODELS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
     
-    # Aggregate by date
-    agg_data = category_data.groupby(['date', 'days_since_start']).agg({
-        'price': 'mean'
-    }).reset_index()
+        # Gather category rows via the precomputed index: no full-column scan
+        category_idx = CATEGORY_INDEX.get(category)
+        category_data = DF_CLEAN.take(category_idx) if category_idx is not None else DF_CLEAN.iloc[0:0]
+
+        # Narrow to similar price band if current price is known
+        if target_price and target_price > 0 and len(category_data) > 0:
+            means = category_data.groupby('product_name', observed=True)['price'].mean().reset_index()
+            lower = target_price * 0.6
+            upper = target_price * 1.4
+            matched_names = means[(means['price'] >= lower) & (means['price'] <= upper)]['product_name'].tolist()
+            if len(matched_names) >= 2:
+                category_data = category_data[category_data['product_name'].isin(matched_names)]
     
-    X = agg_data[['days_since_start']].values
-    y = agg_data['price'].values
+        if len(category_data) < 10:
+            # Fallback to all data
+            category_data = DF_CLEAN
     
-    model = LinearRegression()
-    model.fit(X, y)
+        # Aggregate by date
+        agg_data = category_data.groupby(['date', 'days_since_start']).agg({
+            'price': 'mean'
+        }).reset_index()
     
-    model_info = {
-        'model': model,
-        'data': agg_data,
-        'r2': model.score(X, y),
-        'slope': model.coef_[0]
-    }
+        x = agg_data['days_since_start'].to_numpy(dtype=np.float64)
+        y = agg_data['price'].to_numpy(dtype=np.float64)
+
+        slope, intercept, r2 = fit_linear_trend(x, y)
+
+        model_info = {
+            'prices': y,
+            'mean_price': float(y.mean()),
+            'r2': r2,
+            'slope': slope,
+            'intercept': intercept,
+            'last_day': int(x[-1])
+        }
     
-    CATEGORY_MODELS_CACHE[cache_key] = model_info
-    return model_info
+        with _MODELS_LOCK:
+            CATEGORY_MODELS_CACHE[cache_key] = model_info
+        return model_info
 
 def get_nearest_product_by_price(target_price):
     """Find dataset product whose mean price is nearest to target price."""
-    if target_price is None or target_price <= 0 or DF_CLEAN is None or len(DF_CLEAN) == 0:
+    if target_price is None or target_price <= 0 or PRODUCT_MEAN_PRICES is None:
         return None
-
-    product_means = DF_CLEAN.groupby('product_name')['price'].mean()
-    if len(product_means) == 0:
+    if len(PRODUCT_MEAN_PRICES) == 0:
         return None
 
-    nearest_name = (product_means - target_price).abs().idxmin()
-    return nearest_name
+    return (PRODUCT_MEAN_PRICES - target_price).abs().idxmin()
 
-def calculate_volatility(prices):
-    """Calculate price volatility."""
-    if len(prices) < 2:
+def calculate_volatility(mean, std, count):
+    """Classify price volatility from precomputed mean and std."""
+    if count < 2:
         return 'Unknown'
-    
-    std = np.std(prices)
-    mean = np.mean(prices)
+
     cv = (std / mean) * 100 if mean > 0 else 0
-    
+
     if cv < 10:
         return 'Low'
     elif cv < 25:
@@ -958,11 +1456,8 @@ def calculate_volatility(prices):
     else:
         return 'High'
 
-def generate_product_image_url(product_name, source):
-    """Generate a local SVG placeholder image as data URI."""
-    label = (product_name or "Product")[:22]
-    source_label = (source or "store").upper()
-    svg = f"""
+# Static SVG chrome pre-quoted once; only label/source vary per call
+_SVG_RAW = """
     <svg xmlns='http://www.w3.org/2000/svg' width='300' height='300'>
       <defs>
         <linearGradient id='bg' x1='0' y1='0' x2='1' y2='1'>
@@ -973,31 +1468,48 @@ def generate_product_image_url(product_name, source):
       <rect width='100%' height='100%' fill='url(#bg)'/>
       <rect x='18' y='18' width='264' height='264' rx='16' fill='none' stroke='#334155' stroke-width='2'/>
       <text x='50%' y='47%' text-anchor='middle' fill='#94a3b8' font-size='20' font-family='Arial, sans-serif'>No Image</text>
-      <text x='50%' y='57%' text-anchor='middle' fill='#6366f1' font-size='14' font-family='Arial, sans-serif'>{label}</text>
-      <text x='50%' y='66%' text-anchor='middle' fill='#64748b' font-size='12' font-family='Arial, sans-serif'>{source_label}</text>
+      <text x='50%' y='57%' text-anchor='middle' fill='#6366f1' font-size='14' font-family='Arial, sans-serif'>%LABEL%</text>
+      <text x='50%' y='66%' text-anchor='middle' fill='#64748b' font-size='12' font-family='Arial, sans-serif'>%SOURCE%</text>
     </svg>
     """.strip()
-    return "data:image/svg+xml;utf8," + quote(svg)
+_SVG_PREFIX, _SVG_MID, _SVG_SUFFIX = (
+    quote(segment) for segment in re.split('%LABEL%|%SOURCE%', _SVG_RAW)
+)
+
+def generate_product_image_url(product_name, source):
+    """Generate a local SVG placeholder image as data URI."""
+    label = (product_name or "Product")[:22]
+    source_label = (source or "store").upper()
+    return (
+        "data:image/svg+xml;utf8,"
+        + _SVG_PREFIX + quote(label) + _SVG_MID + quote(source_label) + _SVG_SUFFIX
+    )
 
 # ==========================================
 # MAIN
 # ==========================================
-if __name__ == '__main__':
-    import os
-    
-    # Auto-initialize if data file exists
-    if os.path.exists('data.csv'):
-        print("Auto-initializing with data.csv...")
+def create_app(data_file='data.csv'):
+    """App factory for WSGI servers: each worker loads the dataset once."""
+    if os.path.exists(data_file):
         try:
-            df, first_date = load_and_preprocess_data('data.csv')
-            DF_CLEAN = aggregate_by_product_and_date(df)
-            FIRST_DATE = first_date
-            print(f"Loaded {len(DF_CLEAN)} records")
-            print(f"{DF_CLEAN['product_name'].nunique()} unique products")
+            load_dataset(data_file)
+            log.info("Loaded %d records (%d unique products)",
+                     len(DF_CLEAN), DF_CLEAN['product_name'].nunique())
         except Exception as e:
-            print(f"Error loading data: {e}")
+            log.error("Error loading data: %s", e)
     else:
-        print("No data.csv found. Please run generate_sample_data.py first")
+        log.warning("No %s found. Please run generate_sample_data.py first", data_file)
+    return app
+
+if __name__ == '__main__':
+    # Hot-path diagnostics are log.debug; raise to DEBUG when troubleshooting
+    logging.basicConfig(level=logging.WARNING)
+
+    print("Auto-initializing with data.csv...")
+    create_app('data.csv')
+    if DF_CLEAN is not None:
+        print(f"Loaded {len(DF_CLEAN)} records")
+        print(f"{DF_CLEAN['product_name'].nunique()} unique products")
     
     print("\n🚀 Enhanced Price Predictor API Server")
     print("=" * 60)
@@ -6,18 +6,17 @@ Generates realistic product price data for testing
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
 
 def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
     """
     Generate sample e-commerce data.
-    
+
     Args:
         num_products: Number of unique products
         days: Number of days of historical data
         output_file: Output CSV filename
     """
-    
+
     # Product categories and names
     products = [
         # Electronics
@@ -31,7 +30,7 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
         "Canon EOS R6 Camera",
         "Bose QuietComfort Earbuds II",
         "Apple Watch Series 9",
-        
+
         # Home & Kitchen
         "Instant Pot Duo Plus 9-in-1",
         "Dyson V15 Detect Vacuum",
@@ -43,7 +42,7 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
         "LG Washing Machine Front Load",
         "Cuisinart Food Processor",
         "Roomba i7+ Robot Vacuum",
-        
+
         # Fashion
         "Nike Air Max 270 Running Shoes",
         "Adidas Ultraboost 22 Sneakers",
@@ -55,7 +54,7 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
         "Puma Running T-Shirt",
         "Under Armour Sports Backpack",
         "Herschel Supply Co Backpack",
-        
+
         # Books & Stationery
         "Atomic Habits Hardcover Book",
         "The Psychology of Money",
@@ -67,7 +66,7 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
         "Wacom Drawing Tablet",
         "HP DeskJet Printer",
         "Staedtler Pencil Set",
-        
+
         # Sports & Fitness
         "Yoga Mat Premium Non-Slip",
         "Fitbit Charge 5 Tracker",
@@ -80,81 +79,74 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
         "Foam Roller Massage",
         "Boxing Gloves Professional"
     ]
-    
+
+    rng = np.random.default_rng()
+    selected = products[:num_products]
+
     # Base prices for products (in rupees)
-    base_prices = {
-        product: random.uniform(500, 80000) 
-        for product in products[:num_products]
-    }
-    
-    # Generate data
-    data = []
+    base_prices = dict(zip(selected, rng.uniform(500, 80000, len(selected))))
+
+    # Generate data: one vectorized pass per product instead of a
+    # products x days x sales Python loop appending dicts
     start_date = datetime.now() - timedelta(days=days)
-    
+    day_arr = np.arange(days)
+    trends = ['increasing', 'decreasing', 'stable', 'seasonal']
+
     print(f"Generating {num_products} products over {days} days...")
-    
-    for product in list(base_prices.keys()):
-        base_price = base_prices[product]
-        
+
+    frames = []
+    for product, base_price in base_prices.items():
         # Determine trend (increasing, decreasing, or stable)
-        trend = random.choice(['increasing', 'decreasing', 'stable', 'seasonal'])
-        
-        for day in range(days):
-            current_date = start_date + timedelta(days=day)
-            
-            # Skip some days randomly to make it realistic
-            if random.random() < 0.3:  # 30% chance of no sale that day
-                continue
-            
-            # Calculate price based on trend
-            if trend == 'increasing':
-                # Gradually increasing price
-                trend_price = base_price + (day * base_price * 0.001)
-            elif trend == 'decreasing':
-                # Gradually decreasing price
-                trend_price = base_price - (day * base_price * 0.001)
-            elif trend == 'seasonal':
-                # Seasonal variation (sine wave)
-                seasonal_factor = np.sin(day / 30) * 0.1
-                trend_price = base_price * (1 + seasonal_factor)
-            else:
-                # Stable with minor fluctuations
-                trend_price = base_price
-            
-            # Add random daily fluctuation (±5%)
-            daily_fluctuation = random.uniform(-0.05, 0.05)
-            price = trend_price * (1 + daily_fluctuation)
-            
-            # Ensure price is positive
-            price = max(price, base_price * 0.5)
-            
-            # Random number of sales per day
-            num_sales = random.randint(1, 5)
-            for _ in range(num_sales):
-                data.append({
-                    'InvoiceDate': current_date.strftime('%Y-%m-%d %H:%M:%S'),
-                    'Description': product,
-                    'UnitPrice': round(price, 2)
-                })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
+        trend = rng.choice(trends)
+
+        if trend == 'increasing':
+            # Gradually increasing price
+            trend_price = base_price + day_arr * base_price * 0.001
+        elif trend == 'decreasing':
+            # Gradually decreasing price
+            trend_price = base_price - day_arr * base_price * 0.001
+        elif trend == 'seasonal':
+            # Seasonal variation (sine wave)
+            trend_price = base_price * (1 + np.sin(day_arr / 30) * 0.1)
+        else:
+            # Stable with minor fluctuations
+            trend_price = np.full(days, base_price)
+
+        # Add random daily fluctuation (±5%), floor at half the base price
+        daily_fluctuation = rng.uniform(-0.05, 0.05, days)
+        price = np.maximum(trend_price * (1 + daily_fluctuation), base_price * 0.5)
+
+        # Skip some days randomly to make it realistic (30% chance of no sale),
+        # then expand each remaining day by its random sales count
+        keep = rng.random(days) >= 0.3
+        kept_days = day_arr[keep]
+        kept_prices = np.round(price[keep], 2)
+        num_sales = rng.integers(1, 6, len(kept_days))
+
+        dates = start_date + pd.to_timedelta(np.repeat(kept_days, num_sales), unit='D')
+        frames.append(pd.DataFrame({
+            'InvoiceDate': dates.strftime('%Y-%m-%d %H:%M:%S'),
+            'Description': product,
+            'UnitPrice': np.repeat(kept_prices, num_sales)
+        }))
+
+    df = pd.concat(frames, ignore_index=True)
+
     # Shuffle data
     df = df.sample(frac=1).reset_index(drop=True)
-    
+
     # Save to CSV
     df.to_csv(output_file, index=False)
-    
+
     print(f"\n✓ Generated {len(df)} records")
     print(f"✓ {df['Description'].nunique()} unique products")
     print(f"✓ Date range: {df['InvoiceDate'].min()} to {df['InvoiceDate'].max()}")
     print(f"✓ Saved to: {output_file}")
-    
+
     # Print sample
     print("\nSample data:")
     print(df.head(10))
-    
+
     # Print price statistics
     print("\nPrice statistics:")
     print(df.groupby('Description')['UnitPrice'].agg(['mean', 'min', 'max', 'count']).head())
@@ -162,14 +154,14 @@ def generate_sample_data(num_products=50, days=180, output_file='data.csv'):
 if __name__ == "__main__":
     print("🔧 Sample Data Generator for Smart Price Predictor")
     print("=" * 60)
-    
+
     # Generate data
     generate_sample_data(
         num_products=50,    # Number of products
         days=180,           # 6 months of data
         output_file='data.csv'
     )
-    
+
     print("\n✅ Data generation complete!")
     print("\nNext steps:")
     print("  1. Run: python app.py")
@@ -15,6 +15,38 @@ def print_header(text):
     print(f"  {text}")
     print("=" * 60)
 
+def test_ld_json_extraction():
+    """Offline check: structured JSON-LD extraction must work on its own."""
+    print_header("TEST 0: JSON-LD Price Extraction (offline)")
+    try:
+        from app_enhanced import PriceScraper, _parse_html
+
+        html = (
+            '<html><head><script type="application/ld+json">'
+            '{"@context":"https://schema.org","@type":"Product",'
+            '"offers":{"@type":"Offer","price":"1,299.00","priceCurrency":"INR"}}'
+            '</script></head><body>no visible price</body></html>'
+        )
+        # html=None disables the regex fallback, so only the structured
+        # path can produce this price — a silent fall-through fails here
+        price = PriceScraper.extract_price_from_ld_json(None, tree=_parse_html(html))
+        if price != 1299.0:
+            print(f"✗ Structured extraction returned {price}, expected 1299.0")
+            return False
+        print(f"✓ Structured ld+json price extracted: {price}")
+
+        # The streamed sync scrapers parse tree-only (no raw HTML string),
+        # so the full parse must also find an ld+json-only price
+        details = PriceScraper.parse_amazon(tree=_parse_html(html))
+        if details.get('price') != 1299.0:
+            print(f"✗ Tree-only parse returned {details.get('price')}, expected 1299.0")
+            return False
+        print(f"✓ Tree-only (streamed) parse found price: {details['price']}")
+        return True
+    except Exception as e:
+        print(f"✗ Failed: {e}")
+        return False
+
 def test_health():
     """Test health endpoint."""
     print_header("TEST 1: Health Check")
@@ -101,6 +133,11 @@ def main():
     print("Make sure the Flask server is running on http://localhost:5000")
     print("=" * 60)
     
+    # Test 0: Offline parser check (no server needed)
+    if not test_ld_json_extraction():
+        print("\n❌ JSON-LD extraction broken. Check app_enhanced.py.")
+        sys.exit(1)
+
     # Test 1: Health
     if not test_health():
         print("\n❌ Server not responding. Please start the Flask server:")
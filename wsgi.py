@@ -0,0 +1,10 @@
+"""
+WSGI entrypoint for production servers.
+
+Run with:
+    gunicorn wsgi:app -w 4 -k gthread --threads 16 --timeout 60
+"""
+
+from app_enhanced import create_app
+
+app = create_app()